@@ -69,7 +69,9 @@ def apply_transfer_functions(obj, dx, tfs, fx=None, fy=None, ft=None, fr=None, s
             fy, fx = [forward_ft_unit(dx, n) for n in obj.shape]
 
         fx, fy = optimize_xy_separable(fx, fy)
-        fr, ft = cart_to_polar(fx, fy)
+        # fr and ft are full-size arrays and expensive to compute; only do so
+        # if a transfer function asks for them
+        polar = None
 
     o = obj
     if shift:
@@ -86,6 +88,11 @@ def apply_transfer_functions(obj, dx, tfs, fx=None, fy=None, ft=None, fr=None, s
                 kwargs['fx'] = fx
             if 'fy' in params:
                 kwargs['fy'] = fy
+            if 'fr' in params or 'ft' in params:
+                if polar is None:
+                    polar = cart_to_polar(fx, fy)
+
+                fr, ft = polar
             if 'fr' in params:
                 kwargs['fr'] = fr
             if 'ft' in params:
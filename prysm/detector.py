@@ -3,7 +3,10 @@ import numbers
 import functools
 import itertools
 
+import numpy as truenp
+
 from .mathops import np
+from .coordinates import optimize_xy_separable
 
 def apply_lut(img, lut):
     """Apply a lookup table to img.
@@ -149,6 +152,39 @@ class Detector:
         return output
 
 
+def _sinc(x, scale):
+    """sinc(x*scale), with the division done in place into the output of sin."""
+    y = np.asarray(x * (np.pi * scale))
+    # same trick as np.sinc, sin(tiny)/tiny == 1
+    y[y == 0] = 1e-20
+    out = np.sin(y)
+    out /= y
+    return out
+
+
+def _product_inplace(a, b):
+    """a * b, accumulating into a when it already has the output shape and dtype."""
+    if a.shape == b.shape and a.dtype == b.dtype:
+        a *= b
+        return a
+
+    return a * b
+
+
+def _separable_xy(x, y):
+    """Reduce x, y to a row and column vector, if they are a meshgrid."""
+    if getattr(x, 'ndim', 0) == 2 and getattr(y, 'ndim', 0) == 2:
+        # broadcast views have zero stride along the repeated axis and are
+        # trivially separable; else we must look at the whole array, but this
+        # is far cheaper than the transcendental functions we avoid
+        x_is_rows = x.strides[0] == 0 or bool((x == x[0]).all())
+        y_is_cols = y.strides[1] == 0 or bool((y == y[:, :1]).all())
+        if x_is_rows and y_is_cols:
+            return optimize_xy_separable(x, y)
+
+    return x, y
+
+
 def olpf_ft(fx, fy, width_x, width_y):
     """Analytic FT of an optical low-pass filter, two or four pole.
 
@@ -168,8 +204,20 @@ def olpf_ft(fx, fy, width_x, width_y):
     numpy.ndarray
         FT of the OLPF
 
+    Notes
+    -----
+    The OLPF is separable in x and y.  If fx and fy form a meshgrid, or are
+    already a row and column vector, the transcendental functions are only
+    evaluated once per row and column.
+
     """
-    return np.cos(2 * width_x * fx) * np.cos(2 * width_y * fy)
+    fx, fy = _separable_xy(fx, fy)
+    # each term is evaluated in place, and one buffer is reused for the product
+    ox = np.asarray(fx * (2. * width_x))
+    np.cos(ox, out=ox)
+    oy = np.asarray(fy * (2. * width_y))
+    np.cos(oy, out=oy)
+    return _product_inplace(ox, oy)
 
 
 def pixel_ft(fx, fy, width_x, width_y):
@@ -191,8 +239,15 @@ def pixel_ft(fx, fy, width_x, width_y):
     numpy.ndarray
         FT of the pixel
 
+    Notes
+    -----
+    The pixel is separable in x and y.  If fx and fy form a meshgrid, or are
+    already a row and column vector, the transcendental functions are only
+    evaluated once per row and column.
+
     """
-    return np.sinc(fx * width_x) * np.sinc(fy * width_y)
+    fx, fy = _separable_xy(fx, fy)
+    return _product_inplace(_sinc(fx, width_x), _sinc(fy, width_y))
 
 
 def pixel(x, y, width_x, width_y):
@@ -215,12 +270,77 @@ def pixel(x, y, width_x, width_y):
         spatial representation of the pixel
 
     """
+    x, y = _separable_xy(x, y)
     width_x = width_x / 2
     width_y = width_y / 2
-    return (x <= width_x) & (x >= -width_x) & (y <= width_y) & (y >= -width_y)
+    # abs halves the comparisons; a meshgrid makes them only N each
+    return (abs(x) <= width_x) & (abs(y) <= width_y)
+
+
+def pixel_batch(x, y, widths_x, widths_y):
+    """Spatial representation of several pixels of different sizes.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        x coordinates
+    y : numpy.ndarray
+        y coordinates
+    widths_x : iterable of float
+        x diameter of each pixel, in microns
+    widths_y : iterable of float
+        y diameter of each pixel, in microns
 
+    Returns
+    -------
+    numpy.ndarray
+        array of shape (K, *x.shape), with K the number of pixels;
+        out[k] == pixel(x, y, widths_x[k], widths_y[k])
+
+    Notes
+    -----
+    This is equivalent to stacking calls to pixel in a loop, but forms all K
+    masks in a single broadcast operation instead of K passes over x and y.
+
+    """
+    x, y = _separable_xy(x, y)
+    bcast = (-1,) + (1,) * max(np.ndim(x), np.ndim(y))
+    width_x = np.asarray(widths_x).reshape(bcast) / 2
+    width_y = np.asarray(widths_y).reshape(bcast) / 2
+    return (abs(x) <= width_x) & (abs(y) <= width_y)
+
+
+@functools.lru_cache(maxsize=32)
+def _bin_sample_indices(factor):
+    """Indices into the (m/f, f, n/f, f, ...) view of bindown for each sample of a bin.
+
+    Each index, e.g. (:, 0, :, 1), is a strided view of one sample position
+    within every bin.  Axes with a factor of 1 have no bin axis in the view and
+    get only a slice.  Cached, since a program typically bins with only one or
+    a few factors.
+
+    """
+    offsets = itertools.product(*(range(n) if n != 1 else (None,) for n in factor))
+    return tuple(
+        tuple(itertools.chain(*((slice(None),) if o is None else (slice(None), o) for o in offs)))
+        for offs in offsets)
+
+
+# bins with at most this many samples are summed by adding together strided
+# views of each sample position within the bin, which is 1.5-4x faster than
+# reducing the view along short axes.  Beyond about 3x3, the reduction wins
+_BINDOWN_MAX_SAMPLES_UNROLLED = 9
 
-def bindown(array, factor, mode='avg'):
+# mode => whether the binned sum is normalized to an average
+_BINDOWN_MODES = {
+    'avg': True,
+    'average': True,
+    'mean': True,
+    'sum': False,
+}
+
+
+def bindown(array, factor, mode='avg', dtype=None):
     """Bin (resample) an array.
 
     Parameters
@@ -232,6 +352,15 @@ def bindown(array, factor, mode='avg'):
         else unique factors may be used for each axis.
     mode : str, {'avg', 'sum'}
         sum or avg, how to adjust the output signal
+    dtype : numpy.dtype, optional
+        dtype of the accumulator, and so of the output for a sum or for a
+        floating point average; averaging an integer accumulator returns
+        floats, as for true division of integers.  If None, numpy's rules
+        for sum are used; floating point arrays accumulate in their own
+        precision, and integer arrays in the platform integer.  Narrower
+        accumulators, e.g. uint32 for summing uint16 images, or float32 for
+        averaging them, reduce memory traffic for large arrays.  float16
+        arrays are accumulated in float32 and the result returned as float16
 
     Returns
     -------
@@ -240,37 +369,109 @@ def bindown(array, factor, mode='avg'):
 
     Notes
     -----
-    For each axis of array, shape must be an integer multiple of factor.
+    If the shape of array is not an integer multiple of factor along an axis,
+    the residual samples are trimmed symmetrically from both ends of that axis.
+    When the residual is odd, the extra sample is trimmed from the end.
 
     array may be ND, a scalar factor will broadcast to all dimensions.
 
     To bin an image cube e.g. of shape (3, m, n),  use bindown(img, [1, factor, factor])
 
+    If factor is 1 for every axis and dtype is None, array is returned as-is,
+    not a copy.
+
     Raises
     ------
     ValueError
         invalid mode
 
     """
+    avg = _BINDOWN_MODES.get(mode.lower())
+    if avg is None:
+        raise ValueError('mode must be average or sum.')
+
     if isinstance(factor, numbers.Number):
         factor = tuple([factor] * array.ndim)
+    else:
+        factor = tuple(factor)
+
+    if dtype is None and all(n == 1 for n in factor):
+        return array
+
+    # half precision can neither hold large sums nor add many small values
+    # accurately; accumulate in single precision and round once at the end.
+    # Reading float16 still moves half the bytes of a float32 array
+    result_dtype = None
+    if dtype is None and array.dtype == np.float16:
+        dtype = np.float32
+        result_dtype = np.float16
+
+    # trim any residual samples symmetrically; r//2 from the start, the rest
+    # from the end.  The common case is an even multiple of factor, skip the
+    # (no-op) slice then
+    residual = tuple(s % n for s, n in zip(array.shape, factor))
+    if any(residual):
+        trim = tuple(slice(r // 2, s - (r - r // 2)) for s, r in zip(array.shape, residual))
+        array = array[trim]
 
-    # these two lines look very complicated
     # we want to take an array of shape (m, n) and a binning factor of say, 2
     # and reshape the array to (m/2, 2, n/2, 2)
-    # these lines do that, for an arbitrary number of dimensions
-    output_shape = tuple(s//n for s, n in zip(array.shape, factor))
-    output_shape = tuple(itertools.chain(*zip(output_shape, factor)))
-    intermediate_view = array.reshape(output_shape)
-    # reduction axes produces (1, 3) for 2D, or (1, 3, 5) for 3D, etc.
-    reduction_axes = tuple(range(1, 2*array.ndim, 2))
-
-    if mode.lower() in ('avg', 'average', 'mean'):
-        output_data = intermediate_view.mean(axis=reduction_axes)
-    elif mode.lower() == 'sum':
-        output_data = intermediate_view.sum(axis=reduction_axes)
+    # this loop does that, for an arbitrary number of dimensions.  Axes that
+    # are not binned (factor 1) get no bin axis, so no pass is spent reducing
+    # over a length-1 axis; a cube (3, m, n) binned by (1, 2, 2) is viewed as
+    # (3, m/2, 2, n/2, 2) and reduced over axes (2, 4)
+    # splitting axes never needs contiguity, so even when array was trimmed
+    # above this is a view and not a copy
+    view_shape = []
+    reduction_axes = []
+    for s, n in zip(array.shape, factor):
+        view_shape.append(s // n)
+        if n != 1:
+            reduction_axes.append(len(view_shape))
+            view_shape.append(n)
+
+    intermediate_view = array.reshape(view_shape)
+
+    nsamples = functools.reduce(lambda x, y: x*y, factor)
+    if not reduction_axes:
+        # every factor is 1 but a dtype was given; the view aliases the input,
+        # so copy it, both for the dtype and so avg does not divide in place
+        output_data = intermediate_view.astype(dtype)
+    elif 2 <= nsamples <= _BINDOWN_MAX_SAMPLES_UNROLLED and (dtype is not None or array.dtype.kind in 'fc'):
+        # integers without an explicit dtype need numpy's rules for the
+        # accumulator, so they are always reduced
+        samples = _bin_sample_indices(factor)
+        # unsafe casting, as sum does, so a narrower dtype than the input is allowed
+        output_data = np.add(intermediate_view[samples[0]], intermediate_view[samples[1]],
+                             dtype=dtype, casting='unsafe')
+        for idx in samples[2:]:
+            np.add(output_data, intermediate_view[idx], out=output_data, casting='unsafe')
+    elif isinstance(array, truenp.ndarray):
+        # reduce one binning axis at a time, starting from the outermost.
+        # (m/2, 2, n/2, 2) => (m/2, n/2, 2) => (m/2, n/2)
+        # the first pass adds whole contiguous rows together, and each pass
+        # shrinks the data the next one has to read.  This is about twice as
+        # fast as a single reduction over axes (1, 3), which strides across
+        # the array
+        output_data = intermediate_view
+        for i, axis in enumerate(reduction_axes):
+            # each reduction removes one axis ahead of the next
+            output_data = output_data.sum(axis=axis-i, dtype=dtype)
     else:
-        raise ValueError('mode must be average or sum.')
+        # the reduction order above is for CPU caches.  On a GPU (cupy), one
+        # kernel that reduces every binning axis is better: it is a single
+        # launch with no intermediate array, and parallel over output pixels
+        output_data = intermediate_view.sum(axis=tuple(reduction_axes), dtype=dtype)
+
+    if avg:
+        if output_data.dtype.kind in 'fc':
+            output_data /= nsamples
+        else:
+            # integers, like mean, produce floats
+            output_data = output_data / nsamples
+
+    if result_dtype is not None:
+        output_data = output_data.astype(result_dtype)
 
     return output_data
 
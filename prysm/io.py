@@ -1,10 +1,8 @@
 """File readers for various commercial instruments."""
-from io import StringIO, IOBase
+from io import IOBase
 import math
-import ctypes
-import struct
+import itertools
 import datetime
-import shutil
 
 from pathlib import Path
 
@@ -37,11 +35,11 @@ def read_mtfmapper_sfr_single(file, pixel_pitch=None):
 
     """
     with open(file, 'r') as f:
-        data = f.read()
+        line = f.readline().rstrip('\n')
 
-    floats = [float(d) for d in data.splitlines()[0].split(' ')[:-1]]
-    edge_angle, *mtf = floats
-    mtf = np.asarray(mtf)
+    # the line ends with a separator; drop the field after it, then parse in C
+    floats = truenp.fromstring(line.rsplit(' ', 1)[0], sep=' ')
+    edge_angle, mtf = floats[0], np.asarray(floats[1:])
     freqs = np.arange(len(mtf)) / 64
     if pixel_pitch is not None:  # convert cy/px to cy/mm
         freqs /= (pixel_pitch / 1e3)
@@ -73,9 +71,11 @@ def read_zygo_datx(file):
     # create a handle to the h5 file
     with h5py.File(file, 'r') as f:
         # cast intensity down to int16, saves memory and Zygo doesn't use cameras >> 16-bit
+        # the cast is done by HDF5 during the read, so the stored dtype is never materialized;
+        # unlike numpy, HDF5 saturates out of range values instead of wrapping them
         try:
             intens_block = list(f['Data']['Intensity'].keys())[0]
-            intensity = f['Data']['Intensity'][intens_block][()].astype(np.uint16)
+            intensity = f['Data']['Intensity'][intens_block].astype(np.uint16)[()]
         except (KeyError, OSError):
             intensity = None
 
@@ -97,15 +97,18 @@ def read_zygo_datx(file):
         # step 1, flip (above)
         # step 2, clip the nans
         # step 3, convert punit to nm
-        phase[phase >= no_data] = np.nan
+        invalid = phase >= no_data
         if punit == 'Fringes':
             # the usual conversion per malacara
-            phase = phase * obliquity * scale_factor * wvl
+            # the scalar factors are combined first so the array is scaled in one pass
+            phase = phase * (obliquity * scale_factor * wvl)
         elif punit == 'NanoMeters':
             pass
         else:
             raise ValueError("datx file does not use expected phase unit, contact the prysm author with a sample file to resolve")
 
+        np.copyto(phase, np.nan, where=invalid)
+
         # now get attrs
         attrs = f['Attributes']
         key = list(attrs)[-1]
@@ -174,8 +177,9 @@ def read_zygo_dat(file, multi_intensity_action='first'):
         dictionary with keys: phase, intensity, meta
 
     """
-    with open(file, 'rb') as fid:
-        contents = fid.read()
+    # map rather than read the file; only the phase and one intensity frame are
+    # ever copied out of it, so the raw contents are not held in memory twice
+    contents = truenp.memmap(file, dtype=truenp.uint8, mode='r')
 
     meta = read_zygo_metadata(contents)
     iw, ih, ib = meta['ac_width'], meta['ac_height'], meta['ac_n_buckets']
@@ -190,9 +194,9 @@ def read_zygo_dat(file, multi_intensity_action='first'):
     if multi_intensity_action.lower() == 'avg':
         intensity = intensity.mean(axis=0)
     elif multi_intensity_action.lower() == 'first':
-        intensity = intensity[0]
+        intensity = intensity[0].copy()
     elif multi_intensity_action.lower() == 'last':
-        intensity = intensity[-1]
+        intensity = intensity[-1].copy()
     else:
         raise ValueError(f'multi_intensity_action {multi_intensity_action} not among valid options of avg, first, last.')
 
@@ -200,9 +204,13 @@ def read_zygo_dat(file, multi_intensity_action='first'):
     dt = np.dtype(np.int32).newbyteorder('>')
     phase_raw = np.frombuffer(contents, offset=header_len + ilen * 2, count=plen, dtype=dt)
     phase = phase_raw.astype(config.precision).reshape((ph, pw))
-    phase[phase >= ZYGO_INVALID_PHASE] = np.nan
+    # compare the raw integers, not the converted phase: the comparison is
+    # cheaper than on floats, and in float32 values just below the sentinel
+    # round up to it
+    invalid = (phase_raw >= ZYGO_INVALID_PHASE).reshape((ph, pw))
     phase *= (meta['scale_factor'] * meta['obliquity_factor'] * meta['wavelength'] /
               ZYGO_PHASE_RES_FACTORS[meta['phase_res']]) * 1e9  # unit m to nm
+    np.copyto(phase, np.nan, where=invalid)
     return {
         'phase': phase,
         'intensity': intensity,
@@ -387,13 +395,51 @@ def _zygo_metadata_helper():
         }
 
 
+# the header layout is static; build the table once rather than per file
+_ZYGO_META = _zygo_metadata_helper()
+
+
+def _zygo_header_dtype(meta):
+    """Numpy structured dtype for the Zygo header described by meta.
+
+    Each field carries its own byte order, so the mixed big- and little-endian
+    header is decoded by a single frombuffer.  Pad entries are left out.  'c'
+    fields become one-byte voids, which unlike S1 keep a NUL byte.
+
+    """
+    codes = {'H': 'u2', 'I': 'u4', 'f': 'f4', 'B': 'u1', 'c': 'V1'}
+    names, formats, offsets, strings = [], [], [], []
+    for k, (T, lo, hi, default) in meta.items():
+        if k.startswith('__pad'):
+            continue
+
+        if T.endswith('s'):
+            fmt = f'S{hi-lo}'
+            strings.append(k)
+        else:
+            fmt = codes[T[-1]]
+            if T[0] in '<>':
+                fmt = T[0] + fmt
+
+        names.append(k)
+        formats.append(fmt)
+        offsets.append(lo)
+
+    dt = truenp.dtype({'names': names, 'formats': formats, 'offsets': offsets,
+                       'itemsize': meta['header_size'][3]})
+    return dt, tuple(strings)
+
+
+_ZYGO_HEADER_DTYPE, _ZYGO_HEADER_STRINGS = _zygo_header_dtype(_ZYGO_META)
+
+
 def read_zygo_metadata(file_contents):
     """Parse metadata from the contents of a binary Zygo file.
 
     Parameters
     ----------
-    file_contents : bytes
-        binary file contents
+    file_contents : bytes or buffer
+        binary file contents, e.g. bytes or a numpy.memmap of the file
 
     Returns
     -------
@@ -401,20 +447,13 @@ def read_zygo_metadata(file_contents):
         dictionary with a shitload of keys for all of Zygo's metadata.
 
     """
-    defaults = _zygo_metadata_helper()
-    out = {}
-    WASTE_BYTE = '\x00'
-    for k, (T, lo, hi, default) in defaults.items():
-        if k.startswith('__pad'):
-            continue
-        try:
-            v = struct.unpack(T, file_contents[lo:hi])[0]
-            if 's' in T:
-                v = v.decode(ZYGO_ENC).rstrip(WASTE_BYTE)
-            out[k] = v
-        except Exception as e:
-            print(k, T, lo, hi, default)
-            raise e
+    # item() converts every field to a python scalar or bytes in one call
+    values = truenp.frombuffer(file_contents, dtype=_ZYGO_HEADER_DTYPE, count=1).item()
+    out = dict(zip(_ZYGO_HEADER_DTYPE.names, values))
+    # numpy already drops the trailing NUL padding of S fields, only decode
+    for k in _ZYGO_HEADER_STRINGS:
+        out[k] = out[k].decode(ZYGO_ENC)
+
     return out
 
 
@@ -435,52 +474,46 @@ def write_zygo_dat(file, phase, dx, wavelength=0.6328, intensity=None):
         intensity data
 
     """
-    defaults = _zygo_metadata_helper()
-    for k, v in defaults.items():
-        defaults[k] = list(v)
-
-    all_keys_pad = [k for k in defaults.keys() if '__pad' in k]
-    for key in all_keys_pad:
-        del defaults[key]
+    defaults = {k: v[3] for k, v in _ZYGO_META.items() if not k.startswith('__pad')}
 
     timestamp = datetime.datetime.now()
     ts = math.floor(timestamp.timestamp())  # unix timestamp
-    buf = ctypes.create_string_buffer(834)
     # need to modify cn_x, cn_y, cn_width, cn_height, cn_n_bytes
-    defaults['scale_factor'][3] = 1.
-    defaults['obliquity_factor'][3] = 1.
-    defaults['lateral_resolution'][3] = dx/1e3  # mm -> m
-    defaults['timestamp'][3] = ts
-    defaults['cn_width'][3] = phase.shape[1]
-    defaults['cn_height'][3] = phase.shape[0]
-    defaults['cn_n_bytes'][3] = phase.size*4  # data gets packed to int32
-    defaults['wavelength'][3] = wavelength/1e6  # um -> m
-
-    defaults['phase_res'][3] = 1  # um -> m
+    defaults['scale_factor'] = 1.
+    defaults['obliquity_factor'] = 1.
+    defaults['lateral_resolution'] = dx/1e3  # mm -> m
+    defaults['timestamp'] = ts
+    defaults['cn_width'] = phase.shape[1]
+    defaults['cn_height'] = phase.shape[0]
+    defaults['cn_n_bytes'] = phase.size*4  # data gets packed to int32
+    defaults['wavelength'] = wavelength/1e6  # um -> m
+
+    defaults['phase_res'] = 1  # um -> m
     phase_res_fctr = ZYGO_PHASE_RES_FACTORS[1]
 
-    for k, (T, lo, hi, val) in defaults.items():
-        try:
-            if 's' in T or T == 'c':
-                # str -> bytes
-                val = val.encode(ZYGO_ENC)
-
-            struct.pack_into(T, buf, lo, val)
-        except Exception as e:
-            print(k, T, lo, hi, '"', val, '"', len(val.encode(ZYGO_ENC)))
-            raise e
+    # the whole header is packed by one record assignment; string fields are
+    # encoded first, and the zeroed record leaves the pad bytes NUL
+    buf = truenp.zeros(1, dtype=_ZYGO_HEADER_DTYPE)
+    buf[0] = tuple(v.encode(ZYGO_ENC) if isinstance(v, str) else v  # str -> bytes
+                   for v in (defaults[k] for k in _ZYGO_HEADER_DTYPE.names))
 
     # reverse conversion from nm into "zygos"
     # zygos -> nm
     # (raw*scale_factor*obliquity*wvl)/phase_res_fctr * 1e9
     # so nm -> zygos
     # (1e9*wvl/phase_res_factor/z)  # 1e9/1e6; I use um, they use m
-    mask = np.isnan(phase)
-    im = ((phase*1e-3*phase_res_fctr)/(wavelength)).astype(np.int32)
-    im[mask] = 2147483640
+    if hasattr(phase, 'get'):
+        # CuPy support; device arrays cannot be non-native byte order
+        phase = phase.get()
+
+    # cast straight to the file's big-endian int32, then mark NaN as invalid
+    invalid = truenp.isnan(phase)
+    dt = truenp.dtype(truenp.int32).newbyteorder('>')
+    with truenp.errstate(invalid='ignore'):
+        bufphs = (phase * (1e-3*phase_res_fctr/wavelength)).astype(dt, order='C')
+
+    truenp.copyto(bufphs, ZYGO_INVALID_PHASE, where=invalid)
 
-    dt = np.dtype(np.int32).newbyteorder('>')
-    bufphs = im.astype(dt).tobytes(order='C')
     if not hasattr(file, 'write'):
         file = open(file, 'wb')
 
@@ -493,6 +526,22 @@ def write_zygo_dat(file, phase, dx, wavelength=0.6328, intensity=None):
     return
 
 
+# rows of ten values formatted per % call when writing Zygo ASCII files
+_ZYGO_ASCII_BLOCK_ROWS = 4096
+
+
+def _format_zygo_ascii_phase(encoded_phase):
+    """Text of the phase of a Zygo ASCII file, ten values per line, a block at a time."""
+    # formatted per block, so the whole body is never in memory
+    boundary = 10 * (encoded_phase.shape[0] // 10)
+    step = 10 * _ZYGO_ASCII_BLOCK_ROWS
+    for start in range(0, boundary, step):
+        block = encoded_phase[start:min(start + step, boundary)]
+        yield ('%d ' * 10 + '\n') * (block.shape[0] // 10) % tuple(block.tolist())
+
+    yield ' '.join(map(str, encoded_phase[boundary:].tolist()))
+
+
 def write_zygo_ascii(file, phase, dx, wavelength=0.6328, intensity=None):
     """Write a Zygo ASCII interferogram file.
 
@@ -526,7 +575,7 @@ def write_zygo_ascii(file, phase, dx, wavelength=0.6328, intensity=None):
     line6 = '"' + ' ' * 39 + '"'
     line7 = '"' + ' ' * 39 + '"'
 
-    timestamp_int = int(str(timestamp.timestamp()).split('.')[0])
+    timestamp_int = math.floor(timestamp.timestamp())
     res = dx * 1e3
     line8 = f'0 0.5 {wavelength*1e-6} 0 1 0 {res} {timestamp_int}'  # end is timestamp in integer seconds
     line9 = f'{py} {px} 0 0 0 0 ' + '"' + ' ' * 9 + '"'
@@ -559,29 +608,22 @@ def write_zygo_ascii(file, phase, dx, wavelength=0.6328, intensity=None):
 
     # process the phase and write out
     coef = ZYGO_PHASE_RES_FACTORS[1]
-    encoded_phase = phase * (coef / wavelength / wavelength / 0.5)
-    encoded_phase[np.isnan(encoded_phase)] = ZYGO_INVALID_PHASE
-    encoded_phase = encoded_phase.astype(np.int64)
-    encoded_phase = encoded_phase.flatten()
-    npts = encoded_phase.shape[0]
-    fits_by_ten = npts // 10
-    boundary = 10 * fits_by_ten
-
-    # create an in-memory buffer and write out the phase to it
-    s = StringIO()
-    s.write(header)
-    s.write('\n'.join([line15, line16, '']))
-    truenp.savetxt(s, encoded_phase[:boundary].reshape(-1, 10), fmt='%d', delimiter=' ', newline=' \n')
-    tail = ' '.join((str(d) for d in encoded_phase[boundary:]))
-    s.write(tail)
-    s.write('\n#\n')
-    s.seek(0)
-
+    invalid = np.isnan(phase)
+    # int64, since |phase| above about 13 um does not fit in int32; the sentinel
+    # is set on the integers, exact for float32 phase
+    with truenp.errstate(invalid='ignore'):
+        encoded_phase = (phase * (coef / wavelength / wavelength / 0.5)).astype(np.int64, order='C')
+
+    np.copyto(encoded_phase, ZYGO_INVALID_PHASE, where=invalid)
+    encoded_phase = encoded_phase.ravel()
+    chunks = itertools.chain((header, '\n'.join([line15, line16, ''])),
+                             _format_zygo_ascii_phase(encoded_phase),
+                             ('\n#\n',))
     if not isinstance(file, IOBase):
         with open(file, 'w') as fd:
-            shutil.copyfileobj(s, fd)
+            fd.writelines(chunks)
     else:
-        shutil.copyfileobj(s, file)
+        file.writelines(chunks)
 
 
 def read_sigfit_zernikes(file):
@@ -629,23 +671,16 @@ def _read_sigfit_zernike_core(text):
     typ = 'Noll' if 'ZEMAX' in lines[2] else 'Fringe'
     normed = True if 'RMS' in lines[2] else False
     rnorm = float(rnorm.lstrip()) * fctr / 1e3
-    coefs = []
     total_lines = len(lines)
     if lines[-1].strip() == '':
         slice_ = slice(4, -1)
     else:
         slice_ = slice(4, total_lines - 1)
-    for line in lines[slice_]:  # last line is blank
-        idx, *coef = line.split(',')
-        if isinstance(coef, list) and len(coef) > 0:
-            coef, *_ = coef
 
-        if coef == '' or coef == []:
-            coefs.append(0)
-        else:
-            coefs.append(float(coef))
-
-    coefs = np.asarray(coefs)
+    # lines are "index,coef[,...]"; a missing or empty coef is zero.  Splitting
+    # at most twice stops before any trailing fields
+    fields = (line.split(',', 2) for line in lines[slice_])  # last line is blank
+    coefs = np.asarray([float(f[1]) if len(f) > 1 and f[1] else 0. for f in fields])
 
     wvl = float(wvl) * fctr
     return surface, {
@@ -671,8 +706,7 @@ def read_sigfit_rigidbody(file):
         all values in mm
 
     """
-    file = str(file)
-    with open(file, 'r') as fid:
+    with open(str(file), 'r') as fid:
         data = fid.readlines()
 
     if '= in' in data[4]:
@@ -680,21 +714,12 @@ def read_sigfit_rigidbody(file):
     else:
         fctr = 1
 
-    data = truenp.genfromtxt(file, skip_header=7, delimiter=',')[:, 4:12]
+    # parse the table from the lines already in memory instead of reading the
+    # file a second time; reshape keeps a single-row table 2D
+    data = truenp.genfromtxt(data[7:], delimiter=',', usecols=range(4, 12)).reshape(-1, 8)
     data[:, 1:] *= fctr
-    out = {}
-    for row in data:
-        sid, dx, dy, dz, rx, ry, rz, dR = row
-        out[int(sid)] = {
-            'dx': dx,
-            'dy': dy,
-            'dz': dz,
-            'rx': rx,
-            'ry': ry,
-            'rz': rz,
-            'dR': dR
-        }
-    return out
+    keys = ('dx', 'dy', 'dz', 'rx', 'ry', 'rz', 'dR')
+    return {int(sid): dict(zip(keys, row)) for sid, *row in data.tolist()}
 
 
 def _find_nth(string, substring, n):
@@ -733,22 +758,24 @@ def write_codev_gridint(array, filename, comment='', typ='SUR'):
         comment = 'CV Grid Sag generated by prysm'
 
     # need to map floats into 16-bit signed integers
-    array = array / 1e3  # nm => um
+    # nm => um is applied to the extrema and folded into the scale below, rather
+    # than making a scaled copy of the whole array first
     NDA_PIX = np.isnan(array)
 
     # grid int is a poorly conceived format.  Can only use 16-bit signed integers
     # for data, and no way to specify offset, so we cannot fully utilize the dynamic
     # range of the EXTREMELY RESTRICTIVE number format if our data's span is not
     # roughly symmetric
-    mn_valid = np.nanmin(array)
-    mx_valid = np.nanmax(array)
-    if abs(mn_valid) < np.finfo(array.dtype).eps or (mn_valid > 0):
+    mn_valid = np.nanmin(array) / 1e3
+    mx_valid = np.nanmax(array) / 1e3
+    if abs(mn_valid) < np.finfo(mn_valid.dtype).eps or (mn_valid > 0):
         mn_valid = 1  # means we will always scale based on max valid
     scale_down = -32767 / mn_valid
     scale_up = +32767 / mx_valid
     scale = min(scale_down, scale_up)
-    array = array * scale
-    array = np.around(array).astype(np.int16)
+    array = array * (scale / 1e3)
+    np.around(array, out=array)
+    array = array.astype(np.int16)
 
     array[NDA_PIX] = -32768
 
@@ -758,12 +785,11 @@ def write_codev_gridint(array, filename, comment='', typ='SUR'):
     # limit of 4096 characters per line
     # [-32768 ] = 7 chracters
     # -> can get 585 values per line
-    # TODO: more efficient algorithm to find widest line
-    width = 585
-    while (array.size % width) != 0:
-        width -= 1
+    # use the widest line that divides the data evenly; at most 585 modulos, and
+    # a row of the array always qualifies when it is no wider than that
+    width = next(w for w in range(585, 0, -1) if array.size % w == 0)
 
-    array = array.ravel().reshape((width, array.size // width))
+    array = array.reshape((array.size // width, width))
     np.savetxt(filename, array, fmt='%d', delimiter=' ', header=hdr, comments='')
 
 
@@ -790,10 +816,10 @@ def write_codev_zfr_int(coefs, filename, comment='CV ZFR generated by prysm', SU
 
     hdr = comment + '\n' + f'ZFR {len(coefs)} {typ} WVL 0.001 SSZ 1\n'
     # 1e3; nm->um
-    formatted = '\n'.join([f'{v:.9f}' for v in coefs])  # g = use "f" or "e" formatting depending on value size
+    formatted = ('%.9f\n' * len(coefs)) % tuple(coefs)
     with open(filename, 'w') as f:
         f.write(hdr)
-        f.write(formatted+'\n')
+        f.write(formatted)
 
     return
 
@@ -812,75 +838,78 @@ def read_codev_gridint(file):
         grid data in array representation, metadata dict
 
     """
-    txt = Path(file).expanduser().read_text()
+    # read bytes; only the short title and header lines are decoded, the body
+    # goes to the number parser as-is instead of through a str
+    txt = Path(file).expanduser().read_bytes()
     # feed-forward information that prevents us from doing a whole-text search:
     # the manual specifies that each record must be <= 80 characters, so we
     # can look at 80 character chunks and test for apostrophies
     # this will break for microscopic int files, say 8x8.  I accept the bug
-    end = 80
+    # the scan tracks a position rather than reslicing, which would copy the
+    # whole remaining file once per header line
+    pos = 0
     while True:
-        l = len(txt)  # NOQA - l short
-        if l < end:
-            end = l
-        # it may strictly speaking be faster to compare txt[0] to !, but oh well
-        i = txt[:end].find('!')
+        # it may strictly speaking be faster to compare txt[pos] to !, but oh well
+        i = txt.find(b'!', pos, pos + 80)
         if i < 0:  # no more comments
             break
 
         # we are in a comment, find the newline and skip over that line
-        i = txt.find('\n', i)  # starting from i is a very mild performance improvement
+        i = txt.find(b'\n', i)  # starting from i is a very mild performance improvement
         if i < 0:
             raise ValueError('CV INT file header corrupted - no new line found after !')
         # skip forward
-        txt = txt[i+1:]
+        pos = i + 1
 
     # now on the title line, look for the newline
-    end = txt.find('\n')
+    end = txt.find(b'\n', pos)
     if end < 0:
         raise ValueError('CV INT file header corrupted - no new line found after title')
 
-    title = txt[:end]
+    title = txt[pos:end].decode().rstrip('\r')
 
     # now on the header line, split that off
-    txt = txt[end+1:]
-    end = txt.find('\n')
-    hdr = txt[:end]
+    pos = end + 1
+    end = txt.find(b'\n', pos)
+    hdr = txt[pos:end].decode()
 
     # parsing the header,
     # it is made up of Code V three-letter acronyms and their values
     # a limited parser here of the ones we know how to deal with
     params = hdr.split()  # some tokens are specifiers while others are values
+    tokens = [p.upper() for p in params]  # upper each token once, not once per comparison
     i = 0
     l = len(params)  # NOQA
     wvl, nda = None, None
     while i < l:
-        if params[i].upper() == 'WVL':
+        tok = tokens[i]
+        if tok == 'WVL':
             wvl = float(params[i+1])  # Code V uses microns for this unit, OK
             i += 2
             continue
-        if params[i].upper() == 'SSZ':
+        if tok == 'SSZ':
             ssz = float(params[i+1])  # integers per wavelength of OPD/surface deformation
             i += 2
             continue
-        if params[i].upper() == 'NDA':
+        if tok == 'NDA':
             nda = int(params[i+1])
             i += 2
             continue
-        if params[i].upper() == 'GRD':
+        if tok == 'GRD':
             m = int(params[i+1])
             n = int(params[i+2])
             i += 3
             continue
-        if params[i].upper() == 'SUR':
+        if tok == 'SUR':
             meaning = 'surface error'
             i += 1
             continue
-        if params[i].upper() == 'WFR':
+        if tok == 'WFR':
             meaning = 'wavefront error'
             i += 1
             continue
 
-        if params[i].upper() == 'NNB':
+        if tok == 'NNB':
             # NNB tells Code V to use nearest neighbor interpolation
             # we do not care about instructions Code V has for itself
             i += 1
@@ -898,7 +927,8 @@ def read_codev_gridint(file):
         raise ValueError('CV INT header did not contain GRD, only grid INT files are supported')
 
     main_data = txt[end+1:]
-    a = np.fromstring(main_data, sep=' ', dtype=np.int64)
+    # grid INT data are 16-bit integers; int32 holds them with half the memory of int64
+    a = np.fromstring(main_data, sep=' ', dtype=np.int32)
     mask = a == nda
     # div by ssz converts to wvl, div by wvl to um, *1000 to nm
     a = a.astype(config.precision) * (1000/wvl/ssz)
@@ -931,12 +961,10 @@ def read_codev_psf(fn, sep=','):
 
     """
     with open(fn, 'r') as f:
-        total_lines_skipped = 0
         line = '\n'
         # skip blank lines at top
         while line == '\n':
             line = f.readline()
-            total_lines_skipped += 1
 
         line = line.strip()
         assert line == 'PSF data:', 'dat file must begin with a line, "PSF data:"'
@@ -944,7 +972,6 @@ def read_codev_psf(fn, sep=','):
         # find the grid spacing
         while not line.startswith('Grid spacing:'):
             line = f.readline().lstrip()
-            total_lines_skipped += 1
 
         tmp = line.split(',')
         v = float(tmp[1])
@@ -960,11 +987,13 @@ def read_codev_psf(fn, sep=','):
         # find the array size
         while not line.startswith('Array Size:'):
             line = f.readline().lstrip()
-            total_lines_skipped += 1
 
         array_dim = int(line.split(',')[1])
 
-    arr = np.genfromtxt(fn, skip_header=total_lines_skipped, delimiter=sep)
+        # the data follow the header; parse them from the open file rather
+        # than reopening it and reading past the header a second time
+        arr = np.genfromtxt(f, delimiter=sep)
+
     assert arr.shape == (array_dim, array_dim), 'array size must match header'
     return dx, arr
 
@@ -990,12 +1019,10 @@ def read_codev_bsp(fn, sep=','):
 
     """
     with open(fn, 'r') as f:
-        total_lines_skipped = 0
         line = '\n'
         # skip blank lines at top
         while line == '\n':
             line = f.readline()
-            total_lines_skipped += 1
 
         line = line.strip()
         assert line == 'BSP data:', 'dat file must begin with a line, "BSP data:"'
@@ -1003,7 +1030,6 @@ def read_codev_bsp(fn, sep=','):
         # find the offset
         while not line.startswith('Offset of grid center'):
             line = f.readline().lstrip()
-            total_lines_skipped += 1
 
         tmp = line.split(':')[1]  # chop off the english
         # tmp ~= :  (,0.00025,-0.00025,)
@@ -1014,7 +1040,6 @@ def read_codev_bsp(fn, sep=','):
         # find the grid spacing
         while not line.startswith('Grid spacing:'):
             line = f.readline().lstrip()
-            total_lines_skipped += 1
 
         tmp = line.split(',')
         v = float(tmp[1])  # X
@@ -1032,10 +1057,12 @@ def read_codev_bsp(fn, sep=','):
 
         while not line.startswith('Array Size:'):
             line = f.readline().lstrip()
-            total_lines_skipped += 1
 
         array_dim = tuple(int(v) for v in line.split(',')[1:])
 
-    arr = np.genfromtxt(fn, skip_header=total_lines_skipped, delimiter=sep)
+        # the data follow the header; parse them from the open file rather
+        # than reopening it and reading past the header a second time
+        arr = np.genfromtxt(f, delimiter=sep)
+
     assert arr.shape == array_dim, 'array size must match header'
     return (dx, dy), xyoffset, arr
@@ -5,7 +5,7 @@ import pytest
 
 import numpy as np
 
-from prysm import convolution, degredations
+from prysm import convolution, degredations, detector, fttools
 
 def test_conv_functions():
     a = np.random.rand(100, 100)
@@ -21,3 +21,19 @@ def test_apply_tf_functions():
     a = np.random.rand(100, 100)
     aprime = convolution.apply_transfer_functions(a, 1, [sm, ji])
     assert aprime.shape == a.shape
+
+
+def test_apply_tf_functions_cartesian_only():
+    px = partial(detector.pixel_ft, width_x=1, width_y=2)
+    olpf = partial(detector.olpf_ft, width_x=0.5, width_y=0.25)
+    ji = partial(degredations.jitter_ft, scale=1)
+    a = np.random.rand(100, 120)
+    aprime = convolution.apply_transfer_functions(a, 1, [px, olpf, ji])
+    assert aprime.shape == a.shape
+
+    fy, fx = [fttools.forward_ft_unit(1, n) for n in a.shape]
+    fxx, fyy = np.meshgrid(fx, fy)
+    fr = np.hypot(fxx, fyy)
+    tf = detector.pixel_ft(fxx, fyy, 1, 2) * detector.olpf_ft(fxx, fyy, 0.5, 0.25) * degredations.jitter_ft(fr, 1)
+    ref = np.fft.fftshift(np.fft.ifft2(np.fft.fft2(a) * tf).real)
+    assert np.allclose(aprime, ref)
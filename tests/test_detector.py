@@ -21,6 +21,22 @@ def test_pixel_shades_properly():
     assert px.sum() == 121
 
 
+def test_pixel_shades_rectangles_properly():
+    px = detector.pixel(x, y, 10, 6)
+    # 11 columns by 7 rows
+    assert px.sum() == 77
+    assert px.shape == x.shape
+
+
+def test_pixel_batch_matches_pixel():
+    wx = [10, 6, 3]
+    wy = [10, 4, 7]
+    px = detector.pixel_batch(x, y, wx, wy)
+    assert px.shape == (3, *x.shape)
+    for k in range(3):
+        assert (px[k] == detector.pixel(x, y, wx[k], wy[k])).all()
+
+
 def test_analytic_fts_function():
     # these numbers have no meaning, and the sense of x and y is wrong.  Just
     # testing for crashes.
@@ -31,6 +47,19 @@ def test_analytic_fts_function():
     assert pixel_ft.any()
 
 
+def test_analytic_fts_match_direct_evaluation():
+    olpf_ft = detector.olpf_ft(x, y, 1.234, 4.567)
+    assert np.allclose(olpf_ft, np.cos(2 * 1.234 * x) * np.cos(2 * 4.567 * y))
+    pixel_ft = detector.pixel_ft(x, y, 9.876, 5.4321)
+    assert np.allclose(pixel_ft, np.sinc(x * 9.876) * np.sinc(y * 5.4321))
+
+
+def test_analytic_fts_correct_for_nonseparable_coords():
+    xx, yy = coordinates.polar_to_cart(r, t + 0.1)
+    olpf_ft = detector.olpf_ft(xx, yy, 1.234, 4.567)
+    assert np.allclose(olpf_ft, np.cos(2 * 1.234 * xx) * np.cos(2 * 4.567 * yy))
+
+
 def test_detector_functions():
     d = detector.Detector(0.1, 8, 200, 60_000, .5, 14, 1)
     field = np.ones((128, 128))
@@ -44,3 +73,76 @@ def test_bindown_tile_reciprocate():
     tiled = detector.tile(binned, 4, 'sum')
     assert tiled.shape == d.shape
     assert tiled.sum() == pytest.approx(d.sum())  # energy conservation scaling
+
+
+@pytest.mark.parametrize('mode', ['avg', 'sum'])
+def test_bindown_matches_reshape_reduction(mode):
+    d = np.random.rand(3, 16, 24)
+    binned = detector.bindown(d, (1, 4, 2), mode)
+    view = d.reshape(3, 1, 4, 4, 12, 2)
+    if mode == 'avg':
+        ref = view.mean(axis=(1, 3, 5))
+    else:
+        ref = view.sum(axis=(1, 3, 5))
+    assert np.allclose(binned, ref)
+
+
+def test_bindown_trims_residual_symmetrically():
+    d = np.arange(11*10).reshape(11, 10)
+    binned = detector.bindown(d, 4, 'sum')
+    # 3 residual rows (1 from the top, 2 from the bottom),
+    # 2 residual columns (1 from each side)
+    ref = detector.bindown(d[1:9, 1:9], 4, 'sum')
+    assert binned.shape == (2, 2)
+    assert (binned == ref).all()
+
+
+def test_bindown_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        detector.bindown(np.ones((4, 4)), 2, 'median')
+
+
+def test_bindown_accumulates_in_requested_dtype():
+    d = np.random.randint(0, 4096, (16, 16)).astype(np.uint16)
+    binned = detector.bindown(d, 4, 'sum', dtype=np.uint32)
+    assert binned.dtype == np.uint32
+    assert (binned == detector.bindown(d, 4, 'sum')).all()
+    binned = detector.bindown(d, 4, 'avg', dtype=np.float32)
+    assert binned.dtype == np.float32
+    assert np.allclose(binned, d.reshape(4, 4, 4, 4).mean(axis=(1, 3)))
+    # narrowing casts, on both the unrolled (factor 2) and reduction (factor 4) paths
+    f = np.arange(64.).reshape(8, 8)
+    for factor in (2, 4):
+        for dtype in (np.int32, np.uint8):
+            binned = detector.bindown(f, factor, 'sum', dtype=dtype)
+            assert binned.dtype == dtype
+            assert (binned == detector.bindown(f, factor, 'sum').astype(dtype)).all()
+
+
+def test_bindown_by_one_is_identity():
+    d = np.random.rand(8, 8)
+    assert detector.bindown(d, 1) is d
+
+
+@pytest.mark.parametrize('factor', [2, 16])
+def test_bindown_half_precision_does_not_overflow(factor):
+    d = np.full((32, 32), 300, dtype=np.float16)
+    binned = detector.bindown(d, factor)
+    assert binned.dtype == np.float16
+    assert (binned == 300).all()
+
+
+def test_bindown_by_one_with_dtype_copies():
+    d = np.random.rand(8, 8)
+    d.setflags(write=False)
+    binned = detector.bindown(d, 1, dtype=np.float32)
+    assert binned.dtype == np.float32
+    assert not np.shares_memory(binned, d)
+    assert np.allclose(binned, d)
+
+
+def test_analytic_fts_and_pixel_accept_scalars():
+    assert detector.pixel_ft(0., 0., 1, 1) == pytest.approx(1)
+    assert detector.olpf_ft(0.3, 0.1, 1, 1) == pytest.approx(np.cos(0.6) * np.cos(0.2))
+    assert not detector.pixel(0.2, 0.7, 1, 1)
+    assert detector.pixel_batch(0.2, 0.3, [1, 0.2], [1, 1]).tolist() == [True, False]
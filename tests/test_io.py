@@ -2,6 +2,8 @@
 import os
 import tempfile
 
+import pytest
+
 import numpy as np
 
 from prysm import io, sample_data
@@ -32,6 +34,83 @@ def test_write_zygodat_functions():
     io.write_zygo_dat(tf, dct['phase'], dct['meta']['lateral_resolution'])
 
 
+def test_zygo_dat_roundtrip():
+    phase = np.random.rand(30, 40) * 100
+    phase[3, 4] = np.nan
+    with tempfile.NamedTemporaryFile(suffix='.dat', delete=False) as tf:
+        tf.close()
+        io.write_zygo_dat(tf.name, phase, 0.01, wavelength=0.55)
+        dct = io.read_zygo_dat(tf.name)
+        os.unlink(tf.name)
+
+    meta = dct['meta']
+    assert meta['header_size'] == 834
+    assert (meta['cn_height'], meta['cn_width']) == phase.shape
+    assert meta['cn_n_bytes'] == phase.size * 4
+    assert meta['phase_res'] == 1
+    assert meta['wavelength'] == pytest.approx(0.55e-6)
+    assert meta['lateral_resolution'] == pytest.approx(0.01e-3)
+    assert meta['zoom_descr'] == '   1X '
+    assert meta['wavelength_select'] == '1       '
+    assert dct['phase'].shape == phase.shape
+    assert np.isnan(dct['phase'][3, 4])
+    assert np.isnan(dct['phase']).sum() == 1
+    # one step of the 15-bit phase resolution is 550 nm / 32768 ~= 0.017 nm
+    assert np.allclose(dct['phase'], phase, atol=0.02, equal_nan=True)
+
+
+def test_write_zygo_ascii_layout():
+    # 21 values, two full lines of ten and a partial line of one
+    phase = np.linspace(-50, 50, 21, dtype=np.float32).reshape(3, 7)
+    phase[1, 2] = np.nan
+    with tempfile.NamedTemporaryFile(delete=False) as tf:
+        tf.close()
+        io.write_zygo_ascii(tf.name, phase, 1e-3)
+        with open(tf.name) as f:
+            lines = f.read().splitlines(keepends=True)
+
+        os.unlink(tf.name)
+
+    body = lines[16:-1]
+    assert lines[14:16] == ['#\n', '#\n']
+    assert lines[-1] == '#\n'
+    assert [len(line.split()) for line in body] == [10, 10, 1]
+    assert all(line.endswith(' \n') for line in body[:2])
+    values = np.array(' '.join(body).split(), dtype=np.int64)
+    assert values[9] == io.ZYGO_INVALID_PHASE
+    valid = ~np.isnan(phase.ravel())
+    scale = io.ZYGO_PHASE_RES_FACTORS[1] / 0.6328 / 0.6328 / 0.5
+    assert np.allclose(values[valid], phase.ravel()[valid] * scale, atol=1)
+
+
+def test_write_zygo_ascii_large_phase():
+    # above ~13 um the encoded phase no longer fits in int32
+    phase = np.array([[100, 15000, -15000, np.nan]])
+    with tempfile.NamedTemporaryFile(delete=False) as tf:
+        tf.close()
+        io.write_zygo_ascii(tf.name, phase, 1e-3)
+        with open(tf.name) as f:
+            lines = f.read().splitlines()
+
+        os.unlink(tf.name)
+
+    values = [int(v) for v in lines[16].split()]
+    assert values == [16366167, 2454925113, -2454925113, io.ZYGO_INVALID_PHASE]
+
+
+def test_read_mtfmapper_sfr_single():
+    mtf = np.linspace(1, 0, 65)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as tf:
+        tf.write('4.5 ' + ' '.join(str(v) for v in mtf) + ' \n')
+        tf.write('2.5 ' + ' '.join(str(v) for v in mtf[::-1]) + ' \n')
+        tf.close()
+        freqs, mtf2 = io.read_mtfmapper_sfr_single(tf.name, pixel_pitch=5)
+        os.unlink(tf.name)
+
+    assert np.allclose(mtf, mtf2)
+    assert np.allclose(freqs, np.arange(65) / 64 / 5e-3)
+
+
 def test_codev_gridint_roundtrip():
     # units are nm and grid int has severe problems with resolution
     arr = np.random.rand(32, 32)*100
@@ -45,9 +124,115 @@ def test_codev_gridint_roundtrip():
     assert np.allclose(arr, arr2, atol=1)
 
 
+def test_codev_gridint_line_width():
+    arr = np.random.rand(700, 700)*100
+    with tempfile.NamedTemporaryFile(delete=False) as tf:
+        tf.close()
+        io.write_codev_gridint(arr, tf.name)
+        with open(tf.name) as f:
+            lines = f.read().splitlines()
+
+        arr2, _ = io.read_codev_gridint(tf.name)
+        os.unlink(tf.name)
+
+    # grid int lines are limited to 4096 characters
+    assert max(len(line) for line in lines) <= 4096
+    assert arr2.shape == arr.shape
+
+
 def test_write_codev_zfr_int_functions():
     coefs = np.random.rand(16)
     with tempfile.NamedTemporaryFile('w', delete=False) as tf:
         tf.close()
         io.write_codev_zfr_int(coefs, tf.name)
         os.unlink(tf.name)
+
+
+SIGFIT_ZERNIKES = '''Surface SID=   3 Rnorm=  10.0 Type= 1 WVL= 0.0005 mm
+ Zernike coefficients
+ ZEMAX Standard, RMS normalized
+ N, Coef
+1,0.1
+2,
+3
+4,0.4,extra
+
+'''
+
+SIGFIT_RIGIDBODY = '''header
+header
+header
+header
+units = mm
+header
+a,b,c,d,SID,dx,dy,dz,rx,ry,rz,dR
+0,0,0,0,7,1,2,3,4,5,6,7
+'''
+
+CODEV_PSF = '''
+PSF data:
+Grid spacing:,0.001,MM.
+Array Size:,2
+1,2
+3,4
+'''
+
+CODEV_BSP = '''
+BSP data:
+Offset of grid center: (,0.00025,-0.00025,)
+Grid spacing:,0.001,mm,0.002
+Array Size:,2,3
+1,2,3
+4,5,6
+'''
+
+
+def _read_text_file(reader, text):
+    with tempfile.NamedTemporaryFile('w', delete=False) as tf:
+        tf.write(text)
+        tf.close()
+        out = reader(tf.name)
+        os.unlink(tf.name)
+
+    return out
+
+
+@pytest.mark.parametrize('units, fctr', [('mm', 1), ('in', 25.4)])
+def test_read_sigfit_rigidbody_single_row(units, fctr):
+    out = _read_text_file(io.read_sigfit_rigidbody, SIGFIT_RIGIDBODY.replace('= mm', '= ' + units))
+    assert list(out) == [7]
+    keys = ('dx', 'dy', 'dz', 'rx', 'ry', 'rz', 'dR')
+    assert out[7] == pytest.approx({k: (i + 1) * fctr for i, k in enumerate(keys)})
+
+
+def test_read_sigfit_rigidbody_rows():
+    text = SIGFIT_RIGIDBODY + '0,0,0,0,8,-1,-2,-3,-4,-5,-6,-7\n'
+    out = _read_text_file(io.read_sigfit_rigidbody, text)
+    assert list(out) == [7, 8]
+    assert out[8]['dx'] == pytest.approx(-1)
+    assert out[8]['dR'] == pytest.approx(-7)
+
+
+def test_read_sigfit_zernikes_blank_coefficients():
+    out = _read_text_file(io.read_sigfit_zernikes, SIGFIT_ZERNIKES)
+    assert list(out) == [3]
+    zern = out[3]
+    assert zern['type'] == 'Noll'
+    assert zern['normed']
+    assert zern['rnorm'] == pytest.approx(10)
+    assert zern['wavelength'] == pytest.approx(0.5)
+    # missing and empty coefficients are zero, trailing fields are ignored
+    assert np.allclose(zern['coefs'], np.array([0.1, 0, 0, 0.4]) * 0.5)
+
+
+def test_read_codev_psf():
+    dx, arr = _read_text_file(io.read_codev_psf, CODEV_PSF)
+    assert dx == pytest.approx(1)
+    assert (arr == [[1, 2], [3, 4]]).all()
+
+
+def test_read_codev_bsp():
+    (dx, dy), offset, arr = _read_text_file(io.read_codev_bsp, CODEV_BSP)
+    assert (dx, dy) == pytest.approx((1, 2))
+    assert offset == pytest.approx([0.00025, -0.00025])
+    assert (arr == [[1, 2, 3], [4, 5, 6]]).all()